@@ -9,6 +9,13 @@ import os
 import subprocess
 import argparse
 import re
+import ctypes
+import locale
+import selectors
+import platform
+import math
+import random
+import statistics
 import webbrowser
 import time
 from datetime import datetime
@@ -19,6 +26,25 @@ RELEASE_DATE = "2024-02-02 14:30"
 GITHUB_URL = "https://github.com/Change-Goose-Open-Surce-Software?tab=repositories"
 UPDATE_URL = "https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Loop-Duck/main/install.sh"
 
+# Vergleichsmodus (--compare)
+COMPARE_ALPHA = 0.05          # Signifikanzniveau für den Mann-Whitney-Test
+COMPARE_MIN_PAIRS = 5         # Erster Zwischentest bei -e, danach bei doppelter Paarzahl
+COMPARE_SEPARATOR = "--"      # Trennt Befehl A und B (änderbar mit --sep)
+BOOTSTRAP_RESAMPLES = 2000    # Resamples für das Konfidenzintervall
+
+# ionice Klassen (--ionice)
+IONICE_CLASSES = {"realtime": 1, "best-effort": 2, "idle": 3}
+IOPRIO_CLASS_SHIFT = 13
+IOPRIO_WHO_PROCESS = 1
+# Syscall-Nummern (ioprio_set, ioprio_get) je Architektur
+IOPRIO_SYSCALLS = {
+    "x86_64": (251, 252),
+    "i386": (289, 290),
+    "i686": (289, 290),
+    "aarch64": (30, 31),
+    "armv7l": (314, 315),
+}
+
 # Version History
 VERSION_HISTORY = {
     "1.0": {
@@ -60,12 +86,194 @@ FAQ_DATA = {
 }
 
 
+def mann_whitney_u(a: List[float], b: List[float]) -> Tuple[float, float]:
+    """
+    Zweiseitiger Mann-Whitney-U-Test (Normalapproximation mit Bindungskorrektur)
+    Returns: (U, p_wert)
+    """
+    n1, n2 = len(a), len(b)
+    if n1 == 0 or n2 == 0:
+        return 0.0, 1.0
+    
+    # Gemeinsame Ränge, Bindungen bekommen den mittleren Rang
+    combined = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    ranks = [0.0] * len(combined)
+    tie_sum = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        tie_sum += t ** 3 - t
+        i = j + 1
+    
+    r1 = sum(r for r, (_, group) in zip(ranks, combined) if group == 0)
+    u1 = r1 - n1 * (n1 + 1) / 2
+    
+    n = n1 + n2
+    mu = n1 * n2 / 2
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_sum / (n * (n - 1)))) if n > 1 else 0.0
+    if sigma == 0:
+        return u1, 1.0
+    
+    z = (abs(u1 - mu) - 0.5) / sigma
+    p = math.erfc(max(z, 0.0) / math.sqrt(2))
+    return u1, min(p, 1.0)
+
+
+def parse_cpu_list(spec: str) -> List[int]:
+    """
+    Parse eine CPU-Liste wie `0-3,6`
+    Returns: sortierte Liste der CPU-Nummern
+    """
+    cpus = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            cpus.update(range(int(first), int(last) + 1))
+        else:
+            cpus.add(int(part))
+    if not cpus:
+        raise ValueError(f"Leere CPU-Liste: {spec}")
+    return sorted(cpus)
+
+
+def compare_checkpoints(iterations: int) -> List[int]:
+    """
+    Paarzahlen, bei denen -e testet: 5, 10, 20, ... und zuletzt `iterations`
+    """
+    checkpoints = []
+    pairs = COMPARE_MIN_PAIRS
+    while pairs < iterations:
+        checkpoints.append(pairs)
+        pairs *= 2
+    checkpoints.append(iterations)
+    return checkpoints
+
+
+_libc = None
+
+
+def ioprio_syscall(nr: int, *args: int) -> int:
+    """Ruft ioprio_set/ioprio_get direkt auf (kein Wrapper in der Standardbibliothek)"""
+    global _libc
+    if _libc is None:
+        # Nur einmal laden, run_command ruft das mehrfach pro Loop auf
+        _libc = ctypes.CDLL(None, use_errno=True)
+    result = _libc.syscall(nr, *args)
+    if result < 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+    return result
+
+
+def ioprio_get() -> int:
+    """I/O-Priorität des aktuellen Prozesses"""
+    return ioprio_syscall(IOPRIO_SYSCALLS[platform.machine()][1], IOPRIO_WHO_PROCESS, 0)
+
+
+def ioprio_set(value: int):
+    """Setzt die I/O-Priorität des aktuellen Prozesses (wird an Kinder vererbt)"""
+    ioprio_syscall(IOPRIO_SYSCALLS[platform.machine()][0], IOPRIO_WHO_PROCESS, 0, value)
+
+
+def ioprio_value(ionice_class: int) -> int:
+    """ioprio-Wert einer Klasse, mit Standardstufe 4 wie bei ionice(1)"""
+    level = 0 if ionice_class == IONICE_CLASSES["idle"] else 4
+    return (ionice_class << IOPRIO_CLASS_SHIFT) | level
+
+
+def read_pipes(proc: subprocess.Popen) -> Tuple[bytes, bytes]:
+    """
+    Liest stdout und stderr bis EOF, ohne den Prozess abzuräumen
+    (wie communicate, aber ohne das abschließende wait)
+    """
+    chunks = {proc.stdout: [], proc.stderr: []}
+    with selectors.DefaultSelector() as selector:
+        for pipe in chunks:
+            selector.register(pipe, selectors.EVENT_READ)
+        while selector.get_map():
+            for key, _ in selector.select():
+                data = os.read(key.fd, 32768)
+                if data:
+                    chunks[key.fileobj].append(data)
+                else:
+                    selector.unregister(key.fileobj)
+                    key.fileobj.close()
+    return b"".join(chunks[proc.stdout]), b"".join(chunks[proc.stderr])
+
+
+def decode_output(data: bytes) -> str:
+    """Dekodiert wie subprocess mit text=True"""
+    text = data.decode(locale.getpreferredencoding(False))
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def wait_for_cpu(proc: subprocess.Popen) -> Tuple[int, Optional[int]]:
+    """
+    Wartet auf das Ende des Prozesses und liest vor dem Abräumen aus /proc,
+    auf welchem Kern er zuletzt lief
+    Returns: (returncode, kern)
+    """
+    os.waitid(os.P_PID, proc.pid, os.WEXITED | os.WNOWAIT)
+    cpu = None
+    try:
+        with open(f"/proc/{proc.pid}/stat") as f:
+            # Der Prozessname kann Leerzeichen enthalten, daher ab der letzten Klammer
+            cpu = int(f.read().rsplit(")", 1)[1].split()[36])
+    except (OSError, IndexError, ValueError):
+        pass
+    return proc.wait(), cpu
+
+
+def speedup_interval(a: List[float], b: List[float],
+                     confidence: float = 0.95) -> Tuple[float, float, float]:
+    """
+    Relativer Speedup median(a) / median(b) mit Bootstrap-Konfidenzintervall
+    Returns: (speedup, untere_grenze, obere_grenze)
+    """
+    speedup = statistics.median(a) / statistics.median(b)
+    
+    # Fester Seed, damit gleiche Messwerte das gleiche Intervall liefern
+    rng = random.Random(0)
+    samples = []
+    for _ in range(BOOTSTRAP_RESAMPLES):
+        med_a = statistics.median(rng.choices(a, k=len(a)))
+        med_b = statistics.median(rng.choices(b, k=len(b)))
+        if med_b > 0:
+            samples.append(med_a / med_b)
+    
+    if not samples:
+        return speedup, speedup, speedup
+    
+    samples.sort()
+    tail = (1 - confidence) / 2
+    low = samples[int(tail * (len(samples) - 1))]
+    high = samples[int((1 - tail) * (len(samples) - 1))]
+    return speedup, low, high
+
+
 class LoopDuck:
     """Hauptklasse für Loop Duck Funktionalität"""
     
-    def __init__(self):
+    def __init__(self, cpus: Optional[List[int]] = None,
+                 ionice: Optional[int] = None):
         self.outputs = []
         self.changes_detected = []
+        self.timings = []
+        self.skipped = []
+        self.failed = []
+        self.cores = []
+        
+        # Start-Optionen für die Kindprozesse
+        self.cpus = cpus
+        self.ionice = ionice
         
     def parse_condition(self, condition: str) -> Tuple[str, str, Optional[int]]:
         """
@@ -103,6 +311,8 @@ class LoopDuck:
                 return False
                 
             has_changes = self.changes_detected[check_idx]
+            if has_changes is None:  # Loop übersprungen, kein Ergebnis
+                return False
             
             if comparison == "=p":  # positiv (Änderungen vorhanden)
                 return has_changes
@@ -111,67 +321,335 @@ class LoopDuck:
                 
         return False
     
+    def run_command(self, command: List[str],
+                    show_output: bool = False) -> Tuple[int, str, float, Optional[int]]:
+        """
+        Führt einen Befehl einmal aus, optional gepinnt auf --cpus und mit --ionice
+        Returns: (returncode, output, dauer_in_sekunden, kern)
+        Der Kern ist nur mit --cpus/--ionice bekannt, sonst None.
+        """
+        if not self.cpus and self.ionice is None:
+            start = time.perf_counter()
+            if show_output:
+                # Zeige vollen Output
+                result = subprocess.run(command, 
+                                      capture_output=False,
+                                      text=True)
+                output = ""
+            else:
+                # Capture Output für Vergleich
+                result = subprocess.run(command, 
+                                      capture_output=True,
+                                      text=True)
+                output = result.stdout + result.stderr
+            elapsed = time.perf_counter() - start
+            return result.returncode, output, elapsed, None
+        
+        # Affinität und ionice im Elternprozess setzen und direkt nach dem Start
+        # zurücksetzen: nur das Kind erbt sie, Loop Duck liest die Pipes danach
+        # wieder auf allen Kernen. Ohne preexec_fn bleibt der schnelle Startpfad.
+        pipe = None if show_output else subprocess.PIPE
+        saved_affinity = None
+        saved_ioprio = None
+        if self.cpus:
+            saved_affinity = os.sched_getaffinity(0)
+            os.sched_setaffinity(0, set(self.cpus))
+        try:
+            if self.ionice is not None:
+                saved_ioprio = ioprio_get()
+                ioprio_set(ioprio_value(self.ionice))
+            start = time.perf_counter()
+            proc = subprocess.Popen(command, stdout=pipe, stderr=pipe)
+        finally:
+            if saved_ioprio is not None:
+                ioprio_set(saved_ioprio)
+            if saved_affinity is not None:
+                os.sched_setaffinity(0, saved_affinity)
+        
+        try:
+            output = ""
+            if not show_output:
+                stdout, stderr = read_pipes(proc)
+                output = decode_output(stdout) + decode_output(stderr)
+            returncode, cpu = wait_for_cpu(proc)
+        except BaseException:
+            # z.B. Strg+C: Kind nicht zurücklassen
+            proc.kill()
+            proc.wait()
+            raise
+        elapsed = time.perf_counter() - start
+        
+        return returncode, output, elapsed, cpu
+    
+    def run_hooks(self, hooks: List[str], show_output: bool = False,
+                  parallel: bool = False) -> List[bool]:
+        """
+        Führt Hook-Befehle (Shell-Strings) aus, wahlweise gleichzeitig
+        Returns: pro Hook True wenn er erfolgreich war
+        """
+        output = None if show_output else subprocess.DEVNULL
+        
+        if parallel:
+            procs = [subprocess.Popen(hook, shell=True, stdout=output, stderr=output)
+                     for hook in hooks]
+            returncodes = [proc.wait() for proc in procs]
+        else:
+            returncodes = [subprocess.run(hook, shell=True, stdout=output, stderr=output).returncode
+                           for hook in hooks]
+        
+        for hook, returncode in zip(hooks, returncodes):
+            if returncode != 0:
+                print(f"  ⚠ Hook fehlgeschlagen (Exit {returncode}): {hook}")
+        return [returncode == 0 for returncode in returncodes]
+    
     def run_loop(self, iterations: int, command: List[str], 
                  check_changes: bool = False, 
                  show_output: bool = False,
                  quit_after: bool = False,
-                 stop_condition: Optional[str] = None) -> int:
+                 stop_condition: Optional[str] = None,
+                 before: Optional[str] = None,
+                 after: Optional[str] = None,
+                 before_all: Optional[str] = None,
+                 after_all: Optional[str] = None,
+                 overlap_hooks: bool = False) -> int:
         """
         Führt einen Befehl mehrfach aus
+        Nur der Befehl selbst wird gemessen und mit -c verglichen, nicht die Hooks.
+        Mit overlap_hooks läuft das before der nächsten Iteration parallel
+        zum after der aktuellen.
         """
         print(f"🦆 Loop Duck startet {iterations} Iterationen von: {' '.join(command)}")
+        if self.cpus:
+            print(f"  gepinnt auf CPUs: {', '.join(map(str, self.cpus))}")
         print("-" * 60)
         
-        for i in range(1, iterations + 1):
-            print(f"\n▶ Loop {i}/{iterations}")
-            
-            try:
-                if show_output:
-                    # Zeige vollen Output
-                    result = subprocess.run(command, 
-                                          capture_output=False,
-                                          text=True)
-                    output = ""
-                else:
-                    # Capture Output für Vergleich
-                    result = subprocess.run(command, 
-                                          capture_output=True,
-                                          text=True)
-                    output = result.stdout + result.stderr
-                    
-                self.outputs.append(output)
+        if before_all and not all(self.run_hooks([before_all], show_output)):
+            print("\n❌ --before-all fehlgeschlagen, Loop wird nicht gestartet")
+            return 0
+        
+        prefetched = False
+        prefetched_ok = True
+        try:
+            for i in range(1, iterations + 1):
+                print(f"\n▶ Loop {i}/{iterations}")
                 
-                # Check for changes
-                if check_changes and i > 1:
-                    has_changes = self.outputs[-1] != self.outputs[-2]
-                    self.changes_detected.append(has_changes)
+                try:
+                    # Setup (wurde evtl. schon zusammen mit dem letzten Teardown ausgeführt)
+                    setup_ok = prefetched_ok if prefetched else True
+                    if before and not prefetched:
+                        setup_ok = all(self.run_hooks([before], show_output))
+                    prefetched = False
                     
-                    if has_changes:
-                        print("  ✓ Änderungen erkannt")
+                    if not setup_ok:
+                        # Ohne gültigen Zustand weder messen noch vergleichen
+                        print("  ⚠ Setup fehlgeschlagen, Loop wird übersprungen")
+                        self.skipped.append(i)
+                        if check_changes:
+                            self.changes_detected.append(None)
                     else:
-                        print("  ✗ Keine Änderungen")
-                elif check_changes and i == 1:
-                    self.changes_detected.append(False)
-                
-                # Quit-Parameter: Beende Prozess sofort
-                if quit_after and result.returncode == 0:
-                    # Für Programme die im Hintergrund laufen
-                    pass
-                
-                # Check Stop-Condition
-                if stop_condition and self.check_condition(stop_condition, i):
-                    print(f"\n⏹ Stopp-Bedingung erfüllt bei Loop {i}")
+                        # Nur den Befehl abfangen, damit das Teardown trotzdem läuft
+                        try:
+                            returncode, output, elapsed, cpu = self.run_command(command, show_output)
+                        except (OSError, subprocess.SubprocessError) as e:
+                            print(f"  ❌ Fehler: {e}")
+                            returncode, output, elapsed, cpu = None, None, 0.0, None
+                        
+                        if returncode is None:
+                            # Befehl nicht gestartet: kein Ergebnis für -c
+                            self.failed.append(i)
+                            if check_changes:
+                                self.changes_detected.append(None)
+                        else:
+                            if returncode == 0:
+                                self.timings.append(elapsed)
+                                self.cores.append((i, cpu))
+                                core_info = f" (CPU {cpu})" if cpu is not None else ""
+                                print(f"  ⏱ {elapsed * 1000:.2f} ms{core_info}")
+                            else:
+                                # Fehlgeschlagene Läufe verfälschen die Zeiten
+                                self.failed.append(i)
+                                print(f"  ❌ Exit {returncode}, Zeit nicht gewertet")
+                                
+                            self.outputs.append(output)
+                            
+                            # Check for changes (gegen den letzten gemessenen Loop)
+                            if check_changes and len(self.outputs) > 1:
+                                has_changes = self.outputs[-1] != self.outputs[-2]
+                                self.changes_detected.append(has_changes)
+                                
+                                if has_changes:
+                                    print("  ✓ Änderungen erkannt")
+                                else:
+                                    print("  ✗ Keine Änderungen")
+                            elif check_changes:
+                                self.changes_detected.append(False)
+                            
+                            # Quit-Parameter: Beende Prozess sofort
+                            if quit_after and returncode == 0:
+                                # Für Programme die im Hintergrund laufen
+                                pass
+                    
+                    # Check Stop-Condition
+                    stop = bool(stop_condition) and self.check_condition(stop_condition, i)
+                    
+                    # Teardown, bei --overlap zusammen mit dem nächsten Setup
+                    next_before = before if overlap_hooks and not stop and i < iterations else None
+                    hooks = [hook for hook in (after, next_before) if hook]
+                    if hooks:
+                        results = self.run_hooks(hooks, show_output, parallel=overlap_hooks)
+                        prefetched = next_before is not None
+                        # Ergebnis des vorgezogenen Setups für den nächsten Loop merken
+                        prefetched_ok = results[-1]
+                    
+                    if stop:
+                        print(f"\n⏹ Stopp-Bedingung erfüllt bei Loop {i}")
+                        return i
+                        
+                except KeyboardInterrupt:
+                    print(f"\n\n⏸ Unterbrochen bei Loop {i}/{iterations}")
                     return i
+                except Exception as e:
+                    print(f"  ❌ Fehler: {e}")
                     
+            print(f"\n✅ Alle {iterations} Loops abgeschlossen!")
+            return iterations
+        finally:
+            # Auch bei Stopp-Bedingung oder Strg+C
+            self.print_timing_summary()
+            if after_all:
+                self.run_hooks([after_all], show_output)
+    
+    def print_timing_summary(self):
+        """Zeigt die gemessenen Zeiten des Befehls (ohne Hooks)"""
+        if self.skipped:
+            print(f"⚠ Übersprungen (Setup fehlgeschlagen): Loop {', '.join(map(str, self.skipped))}")
+        if self.failed:
+            print(f"❌ Fehlgeschlagen (nicht gewertet): Loop {', '.join(map(str, self.failed))}")
+        if not self.timings:
+            return
+        ms = [t * 1000 for t in self.timings]
+        cpu_info = f", CPUs {', '.join(map(str, self.cpus))}" if self.cpus else ""
+        print(f"⏱ Befehl: median {statistics.median(ms):.2f} ms "
+              f"(min {min(ms):.2f} ms, max {max(ms):.2f} ms, n = {len(ms)}{cpu_info})")
+        
+        # Kern je Loop und Zeiten pro Kern, damit Ausreißer zugeordnet werden können
+        per_core = {}
+        for (loop, cpu), value in zip(self.cores, ms):
+            if cpu is not None:
+                per_core.setdefault(cpu, []).append(value)
+        if per_core:
+            print("  Kern je Loop: " + ", ".join(f"{loop}→CPU {cpu}"
+                                                 for loop, cpu in self.cores if cpu is not None))
+            for cpu, values in sorted(per_core.items()):
+                print(f"  CPU {cpu}: median {statistics.median(values):.2f} ms (n = {len(values)})")
+    
+    def run_compare(self, iterations: int, command_a: List[str], command_b: List[str],
+                    show_output: bool = False,
+                    stop_early: bool = False) -> int:
+        """
+        A/B-Vergleich: führt zwei Befehle abwechselnd aus und vergleicht die Laufzeiten
+        Returns: Anzahl der gewerteten Paare
+        """
+        print(f"🦆 Loop Duck vergleicht in {iterations} Paaren:")
+        print(f"  A: {' '.join(command_a)}")
+        print(f"  B: {' '.join(command_b)}")
+        if self.cpus:
+            print(f"  gepinnt auf CPUs: {', '.join(map(str, self.cpus))}")
+        print("-" * 60)
+        
+        times = {"A": [], "B": []}
+        commands = {"A": command_a, "B": command_b}
+        
+        # Bei -e wird mehrfach getestet: nur an festen Punkten und mit
+        # Bonferroni-korrigiertem α, sonst steigt die Fehlerrate deutlich über α
+        alpha = COMPARE_ALPHA
+        checkpoints = []
+        if stop_early:
+            checkpoints = compare_checkpoints(iterations)
+            alpha = COMPARE_ALPHA / len(checkpoints)
+            print(f"  Zwischentests bei {', '.join(map(str, checkpoints))} Paaren "
+                  f"(α = {alpha:.4f} pro Test)")
+        
+        for i in range(1, iterations + 1):
+            # Reihenfolge abwechseln, damit Drift beide Befehle gleich trifft
+            order = ("A", "B") if i % 2 == 1 else ("B", "A")
+            print(f"\n▶ Paar {i}/{iterations}")
+            
+            try:
+                pair = {}
+                for label in order:
+                    returncode, _, elapsed, cpu = self.run_command(commands[label], show_output)
+                    pair[label] = elapsed if returncode == 0 else None
+                    status = "" if returncode == 0 else f" (Exit {returncode}, nicht gewertet)"
+                    core_info = f" (CPU {cpu})" if cpu is not None else ""
+                    print(f"  {label}: {elapsed * 1000:.2f} ms{core_info}{status}")
+                
             except KeyboardInterrupt:
-                print(f"\n\n⏸ Unterbrochen bei Loop {i}/{iterations}")
-                return i
+                print(f"\n\n⏸ Unterbrochen bei Paar {i}/{iterations}")
+                break
             except Exception as e:
+                # Bisher gewertete Paare trotzdem auswerten
                 print(f"  ❌ Fehler: {e}")
-                
-        print(f"\n✅ Alle {iterations} Loops abgeschlossen!")
-        return iterations
-
+                self.failed.append(i)
+                break
+            
+            # Nur Paare werten, in denen beide Befehle erfolgreich waren
+            if None in pair.values():
+                self.failed.append(i)
+                continue
+            times["A"].append(pair["A"])
+            times["B"].append(pair["B"])
+            pairs = len(times["A"])
+            
+            # Früher Abbruch sobald der Unterschied signifikant ist,
+            # gezählt werden nur gewertete Paare
+            if pairs in checkpoints[:-1]:
+                _, p = mann_whitney_u(times["A"], times["B"])
+                if p < alpha:
+                    print(f"\n⏹ Signifikant nach {pairs} Paaren (p = {p:.4f})")
+                    break
+        
+        if self.failed:
+            print(f"\n❌ Fehlgeschlagen (nicht gewertet): Paar {', '.join(map(str, self.failed))}")
+        self.print_compare_summary(times["A"], times["B"], alpha)
+        return len(times["A"])
+    
+    def print_compare_summary(self, times_a: List[float], times_b: List[float],
+                              alpha: float = COMPARE_ALPHA):
+        """Zeigt Verteilungen, Speedup und Testergebnis eines Vergleichs"""
+        print("\n" + "=" * 60)
+        print("📊 Vergleich")
+        print("=" * 60)
+        
+        if len(times_a) < 2 or len(times_b) < 2:
+            print("❌ Zu wenige Messungen für eine Auswertung (mindestens 2 Paare)")
+            return
+        
+        print(f"\n  {'':3}{'n':>5}{'min':>11}{'median':>11}{'mittel':>11}{'stdev':>11}{'max':>11}")
+        for label, values in (("A", times_a), ("B", times_b)):
+            ms = [v * 1000 for v in values]
+            print(f"  {label:3}{len(ms):>5}"
+                  f"{min(ms):>11.2f}{statistics.median(ms):>11.2f}"
+                  f"{statistics.mean(ms):>11.2f}{statistics.stdev(ms):>11.2f}"
+                  f"{max(ms):>11.2f}")
+        print("  (Zeiten in ms)")
+        
+        if statistics.median(times_b) <= 0:
+            print("\n❌ Median von B ist 0, kein Speedup berechenbar")
+            return
+        
+        speedup, low, high = speedup_interval(times_a, times_b)
+        u, p = mann_whitney_u(times_a, times_b)
+        
+        print(f"\n  Speedup von B (Median A / Median B): {speedup:.3f}x  "
+              f"[95%-KI {low:.3f}x – {high:.3f}x]")
+        print(f"  Mann-Whitney U = {u:.1f}, p = {p:.4f}")
+        
+        if p < alpha:
+            faster = "B" if speedup > 1 else "A"
+            print(f"\n✅ {faster} ist signifikant schneller (α = {alpha:.4f})")
+        else:
+            print(f"\n➖ Kein signifikanter Unterschied (α = {alpha:.4f})")
 
 def print_help():
     """Zeigt ausführliche Hilfe mit Beispielen"""
@@ -203,12 +681,37 @@ BEISPIELE:
         
     Loop -s `-c =n =7` 20 ./test.sh
         → Bricht ab wenn in Loop 7 keine Änderungen erkannt werden
+        
+    Loop -b "rm -rf cache" -a "./cleanup.sh" 10 ./build.sh
+        → Leert vor jedem Loop den Cache und räumt danach auf,
+          gemessen wird nur build.sh
+        
+    Loop --cpus 2-3 --nice 10 50 ./bench.sh
+        → Führt bench.sh nur auf Kern 2 und 3 aus,
+          mit niedrigerer Priorität
+        
+    Loop --compare 20 ./alt.sh -- ./neu.sh
+        → Führt alt.sh und neu.sh abwechselnd 20 mal aus und
+          vergleicht die Laufzeiten (Speedup, Konfidenzintervall, p-Wert)
 
 PARAMETER:
     -c, --changes    Zeigt Unterschiede zwischen Ausführungen
     -o, --output     Zeigt den kompletten Terminal-Output
     -s, --stop       Bricht bei Bedingung ab
     -q, --quit       Beendet Programm sofort nach Start
+    -b, --before     Hook-Befehl vor jedem Loop (nicht gemessen)
+    -a, --after      Hook-Befehl nach jedem Loop (nicht gemessen)
+    --before-all     Hook-Befehl einmal vor dem ersten Loop
+    --after-all      Hook-Befehl einmal nach dem letzten Loop
+    --overlap        before des nächsten Loops läuft parallel zum after
+                     (nur wenn beide Hooks unabhängig voneinander sind)
+    --cpus LISTE     Pinnt jeden Loop auf diese Kerne (z.B. 0-3,6)
+    --nice N         nice-Wert für Loop Duck und alle gestarteten Befehle
+    --ionice KLASSE  ionice-Klasse: idle, best-effort, realtime (oder 1-3)
+    --compare        A/B-Vergleich zweier Befehle, getrennt durch --
+    --sep TRENNER    Anderer Trenner für --compare (wenn A selbst -- nutzt)
+    -e, --early      Vergleich abbrechen sobald signifikant (mit --compare),
+                     getestet bei 5, 10, 20, ... Paaren mit korrigiertem α
 
 GEGEBENHEITEN:
     Bedingungen in Backticks für -s Parameter:
@@ -220,6 +723,14 @@ GEGEBENHEITEN:
 
 HINWEISE:
     • Alle Befehle laufen nacheinander, nicht parallel
+    • --cpus und --ionice gelten nur für den Befehl, nicht für Hooks;
+      --nice gilt für den ganzen Lauf (ohne root nicht rücknehmbar)
+    • Befehle mit Exit-Code ungleich 0 werden nicht in die Zeiten gewertet
+    • Hooks sind Shell-Befehle und müssen in Anführungszeichen stehen
+    • Bei --compare wechselt die Reihenfolge (A,B / B,A) jedes Paar
+    • Bei --compare trennt das erste alleinstehende -- Befehl A von B,
+      z.B. Loop --compare --sep :: 10 git log -- a :: git log -- b
+    • --compare ist nicht mit -c, -s, -q oder Hooks kombinierbar
     • Ein Befehl wird erst wiederholt wenn er beendet wurde
     • Parameter müssen VOR dem Programm stehen
     • Alles nach <Anzahl> gehört zum ausgeführten Befehl
@@ -682,6 +1193,20 @@ def main():
     show_output = False
     quit_after = False
     stop_condition = None
+    compare = False
+    stop_early = False
+    separator = COMPARE_SEPARATOR
+    hooks = {"before": None, "after": None, "before_all": None, "after_all": None}
+    overlap_hooks = False
+    cpus = None
+    nice = None
+    ionice = None
+    hook_options = {
+        "-b": "before", "--before": "before",
+        "-a": "after", "--after": "after",
+        "--before-all": "before_all",
+        "--after-all": "after_all",
+    }
     
     args = sys.argv[1:]
     iterations = None
@@ -700,6 +1225,50 @@ def main():
         elif arg in ["-q", "--quit"]:
             quit_after = True
             i += 1
+        elif arg in hook_options:
+            # Next argument should be the hook command
+            if i + 1 < len(args):
+                hooks[hook_options[arg]] = args[i + 1]
+                i += 2
+            else:
+                print(f"❌ {arg} Parameter benötigt einen Befehl!")
+                return 1
+        elif arg in ["--cpus", "--nice", "--ionice"]:
+            # Next argument should be the value
+            if i + 1 >= len(args):
+                print(f"❌ {arg} Parameter benötigt einen Wert!")
+                return 1
+            value = args[i + 1]
+            try:
+                if arg == "--cpus":
+                    cpus = parse_cpu_list(value)
+                elif arg == "--nice":
+                    nice = int(value)
+                elif value.isdigit():
+                    ionice = int(value)
+                else:
+                    ionice = IONICE_CLASSES[value.lower()]
+            except (ValueError, KeyError):
+                print(f"❌ Ungültiger Wert für {arg}: {value}")
+                return 1
+            i += 2
+        elif arg == "--overlap":
+            overlap_hooks = True
+            i += 1
+        elif arg == "--compare":
+            compare = True
+            i += 1
+        elif arg in ["-e", "--early"]:
+            stop_early = True
+            i += 1
+        elif arg == "--sep":
+            # Next argument should be the separator
+            if i + 1 < len(args):
+                separator = args[i + 1]
+                i += 2
+            else:
+                print("❌ --sep Parameter benötigt einen Trenner!")
+                return 1
         elif arg in ["-s", "--stop"]:
             # Next argument should be the condition
             if i + 1 < len(args):
@@ -725,9 +1294,74 @@ def main():
         print("Verwendung: Loop [Parameter] <Anzahl> <Befehl>")
         return 1
     
+    if not compare and (stop_early or separator != COMPARE_SEPARATOR):
+        used = [name for name, flag in [("-e", stop_early),
+                                        ("--sep", separator != COMPARE_SEPARATOR)] if flag]
+        print(f"❌ {', '.join(used)} nur zusammen mit --compare möglich")
+        return 1
+    
+    # Start-Optionen prüfen
+    if cpus is not None:
+        if not hasattr(os, "sched_setaffinity"):
+            print("❌ --cpus wird auf diesem System nicht unterstützt")
+            return 1
+        unavailable = sorted(set(cpus) - os.sched_getaffinity(0))
+        if unavailable:
+            print(f"❌ CPUs nicht verfügbar: {', '.join(map(str, unavailable))}")
+            return 1
+    if ionice is not None:
+        if ionice not in IONICE_CLASSES.values():
+            print(f"❌ Ungültige ionice-Klasse: {ionice}")
+            return 1
+        # Die Syscall-Nummern gelten nur für Linux, nicht für macOS/BSD
+        if not sys.platform.startswith("linux") or platform.machine() not in IOPRIO_SYSCALLS:
+            print("❌ --ionice wird auf diesem System nicht unterstützt")
+            return 1
+        # Einmal probeweise setzen, damit fehlende Rechte sofort auffallen
+        try:
+            saved_ioprio = ioprio_get()
+            ioprio_set(ioprio_value(ionice))
+            ioprio_set(saved_ioprio)
+        except OSError as e:
+            print(f"❌ ionice-Klasse {ionice} nicht erlaubt: {e.strerror}")
+            return 1
+    if nice:
+        # Gilt für Loop Duck selbst und wird an alle Kindprozesse vererbt
+        try:
+            os.nice(nice)
+        except OSError as e:
+            print(f"❌ nice {nice} nicht erlaubt: {e.strerror}")
+            return 1
+    
+    duck = LoopDuck(cpus, ionice)
+    
+    # A/B-Vergleich: Befehle sind durch -- getrennt
+    if compare:
+        unsupported = [name for name, used in [
+            ("-c", check_changes), ("-s", stop_condition is not None), ("-q", quit_after),
+            ("-b", hooks["before"] is not None), ("-a", hooks["after"] is not None),
+            ("--before-all", hooks["before_all"] is not None),
+            ("--after-all", hooks["after_all"] is not None),
+            ("--overlap", overlap_hooks),
+        ] if used]
+        if unsupported:
+            print(f"❌ --compare unterstützt nicht: {', '.join(unsupported)}")
+            return 1
+        if separator not in command:
+            print(f"❌ --compare benötigt zwei Befehle, getrennt durch {separator}")
+            print("Verwendung: Loop --compare [--sep TRENNER] <Anzahl> <Befehl A> -- <Befehl B>")
+            return 1
+        split = command.index(separator)
+        command_a, command_b = command[:split], command[split + 1:]
+        if not command_a or not command_b:
+            print("❌ Befehl A oder B fehlt!")
+            return 1
+        pairs = duck.run_compare(iterations, command_a, command_b, show_output, stop_early)
+        return 0 if pairs > 0 else 1
+    
     # Run the loop
-    duck = LoopDuck()
-    duck.run_loop(iterations, command, check_changes, show_output, quit_after, stop_condition)
+    duck.run_loop(iterations, command, check_changes, show_output, quit_after, stop_condition,
+                  overlap_hooks=overlap_hooks, **hooks)
     
     return 0
 
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Loop Duck - Benchmarks für den eigenen Overhead
+by Change Goose
+
+Misst ohne Netzwerk die Kosten von Loop Duck selbst und gibt sie als JSON aus,
+damit Versionen miteinander verglichen werden können:
+
+    python3 benchmarks/bench_loopduck.py > bench_output.txt
+    python3 benchmarks/bench_loopduck.py --quick --output bench.json
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import platform
+import argparse
+import statistics
+import subprocess
+import tracemalloc
+import timeit
+import importlib.util
+from contextlib import redirect_stdout
+from typing import List, Dict
+
+LOOPDUCK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Loopduck.py")
+TRUE_BIN = "/bin/true"
+
+
+def load_loopduck():
+    """Lädt Loopduck.py als Modul (kein Paket, daher über den Dateipfad)"""
+    spec = importlib.util.spec_from_file_location("loopduck", LOOPDUCK_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """Kennzahlen einer Messreihe"""
+    return {
+        "min": min(values),
+        "median": statistics.median(values),
+        "mean": statistics.mean(values),
+        "max": max(values),
+        "n": len(values),
+    }
+
+
+def bench_wrapper_overhead(loopduck, iterations: int, repeats: int) -> Dict:
+    """Overhead pro Iteration von run_loop gegenüber einer nackten for-Schleife"""
+    bare = []
+    wrapped = []
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            subprocess.run([TRUE_BIN], capture_output=True, text=True)
+        bare.append((time.perf_counter() - start) / iterations)
+
+        duck = loopduck.LoopDuck()
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            duck.run_loop(iterations, [TRUE_BIN])
+        wrapped.append((time.perf_counter() - start) / iterations)
+
+    return {
+        "iterations": iterations,
+        "bare_loop_s": summarize(bare),
+        "run_loop_s": summarize(wrapped),
+        "overhead_per_iteration_s": min(wrapped) - min(bare),
+    }
+
+
+def bench_changes_memory(loopduck, iterations: int, output_bytes: int) -> Dict:
+    """Speicherwachstum von run_loop mit -c bei großen Ausgaben"""
+    command = [sys.executable, "-c",
+               f"import sys; sys.stdout.write('x' * {output_bytes})"]
+
+    duck = loopduck.LoopDuck()
+    tracemalloc.start()
+    try:
+        with redirect_stdout(io.StringIO()):
+            duck.run_loop(iterations, command, check_changes=True)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "output_bytes": output_bytes,
+        "retained_bytes": current,
+        "peak_bytes": peak,
+        "retained_bytes_per_iteration": current / iterations,
+    }
+
+
+def bench_check_condition(loopduck, calls: int) -> Dict:
+    """Kosten von check_condition pro Aufruf"""
+    duck = loopduck.LoopDuck()
+    duck.changes_detected = [i % 2 == 0 for i in range(1000)]
+
+    results = {}
+    for condition in ["`-c =p`", "`-c =n =7`", "`-c =p =500`"]:
+        timer = timeit.Timer(lambda: duck.check_condition(condition, 500))
+        per_call = min(timer.repeat(repeat=5, number=calls)) / calls
+        results[condition] = {"per_call_s": per_call}
+
+    return {"calls": calls, "conditions": results}
+
+
+def bench_cli_cold_start(repeats: int) -> Dict:
+    """Startzeit von main() in einem frischen Interpreter, abzüglich Python-Start"""
+    def measure(argv: List[str]) -> List[float]:
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            times.append(time.perf_counter() - start)
+        return times
+
+    bare = measure([sys.executable, "-c", "pass"])
+    results = {"bare_interpreter": summarize(bare)}
+    for name, args in [("help", ["--help"]), ("loop_1_true", ["1", TRUE_BIN])]:
+        times = measure([sys.executable, LOOPDUCK_PATH] + args)
+        results[name] = summarize(times)
+        # Anteil von Loop Duck selbst (Imports + main), ohne den Interpreter-Start
+        results[name]["loopduck_s"] = statistics.median(times) - statistics.median(bare)
+    return results
+
+
+def read_cpu_seconds(pid: int) -> float:
+    """CPU-Zeit (user + system) eines Prozesses aus /proc"""
+    with open(f"/proc/{pid}/stat") as f:
+        # Der Prozessname kann Leerzeichen enthalten, daher ab der letzten Klammer
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def bench_tui_idle(duration: float, warmup: float) -> Dict:
+    """CPU-Last des main_menu im Leerlauf unter einem Pseudo-Terminal"""
+    import pty
+    import fcntl
+    import select
+    import struct
+    import termios
+
+    if not os.path.exists("/proc/self/stat"):
+        return {"skipped": "benötigt /proc"}
+
+    master, slave = pty.openpty()
+    fcntl.ioctl(slave, termios.TIOCSWINSZ, struct.pack("HHHH", 40, 100, 0, 0))
+    env = dict(os.environ, TERM="xterm-256color")
+
+    proc = subprocess.Popen([sys.executable, LOOPDUCK_PATH, "duck"],
+                            stdin=slave, stdout=slave, stderr=slave,
+                            env=env, start_new_session=True)
+    os.close(slave)
+
+    def drain(seconds: float):
+        # Ausgabe lesen, sonst blockiert das TUI beim Zeichnen
+        end = time.monotonic() + seconds
+        while time.monotonic() < end:
+            ready, _, _ = select.select([master], [], [], 0.05)
+            if ready:
+                try:
+                    os.read(master, 65536)
+                except OSError:
+                    return
+
+    try:
+        drain(warmup)
+        cpu_start = read_cpu_seconds(proc.pid)
+        wall_start = time.monotonic()
+        drain(duration)
+        cpu_used = read_cpu_seconds(proc.pid) - cpu_start
+        wall = time.monotonic() - wall_start
+    finally:
+        try:
+            os.write(master, b"q")
+            drain(0.2)
+            proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+            proc.wait()
+        os.close(master)
+
+    return {
+        "duration_s": wall,
+        "cpu_s": cpu_used,
+        "cpu_percent": 100 * cpu_used / wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Loop Duck Overhead-Benchmarks (JSON-Ausgabe)")
+    parser.add_argument("--quick", action="store_true", help="Weniger Wiederholungen")
+    parser.add_argument("--output", help="JSON in Datei schreiben statt auf stdout")
+    args = parser.parse_args()
+
+    scale = 1 if args.quick else 5
+    loopduck = load_loopduck()
+
+    results = {
+        "loopduck_version": loopduck.VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": {
+            "wrapper_overhead": bench_wrapper_overhead(loopduck, 40 * scale, 3),
+            "changes_memory": bench_changes_memory(loopduck, 10 * scale, 1024 * 1024),
+            "check_condition": bench_check_condition(loopduck, 20000 * scale),
+            "cli_cold_start": bench_cli_cold_start(4 * scale),
+            "tui_idle": bench_tui_idle(2.0 * scale, 1.0),
+        },
+    }
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())